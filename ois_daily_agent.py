@@ -8,7 +8,8 @@ Run this script daily at 7am via cron or a task scheduler.
 
 import sys
 import os
-from datetime import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 # Add python_modules to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'python_modules'))
@@ -19,62 +20,83 @@ from email_sender import EmailSender
 
 def main():
     """Main execution function."""
-    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Starting OIS Daily Agent...")
+    print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] Starting OIS Daily Agent...")
 
-    # Initialize fetcher
-    fetcher = BOEOISFetcher()
-
-    # Fetch OIS data
-    print("Fetching Bank of England OIS data...")
-    data, error = fetcher.fetch_ois_data()
-
-    if error:
-        print(f"ERROR: {error}")
-        sys.exit(1)
-
-    if not data:
-        print("ERROR: No data returned")
-        sys.exit(1)
-
-    print("✓ Data fetched successfully")
-
-    # Generate summary
-    text_summary = fetcher.format_summary(data)
-    print("\n" + text_summary)
-
-    # Initialize email sender
+    # Initialize email sender and open the SMTP session in the background,
+    # so the connect/login handshake overlaps with the BoE download
     email_sender = EmailSender()
-
-    # Check if email is configured
-    if not email_sender.smtp_user or not email_sender.to_email:
-        print("\n⚠ Email not configured - skipping email send")
-        print("To enable email, set these environment variables:")
-        print("  SMTP_USER, SMTP_PASSWORD, TO_EMAIL")
-        print("\nOptional (with defaults):")
-        print("  SMTP_HOST (default: smtp.gmail.com)")
-        print("  SMTP_PORT (default: 587)")
-        print("  FROM_EMAIL (default: same as SMTP_USER)")
-        return
-
-    # Send email
-    print("\nSending email notification...")
-
-    subject = f"OIS Rates - {data['latest_date'].strftime('%d %B %Y')}"
-    html_body = email_sender.create_ois_html_email(data)
-
-    success, error = email_sender.send_email(
-        subject=subject,
-        body=text_summary,
-        html_body=html_body
-    )
-
-    if success:
-        print(f"✓ Email sent successfully to {email_sender.to_email}")
-    else:
-        print(f"✗ Email failed: {error}")
-        sys.exit(1)
-
-    print(f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] OIS Daily Agent completed")
+    executor = ThreadPoolExecutor(max_workers=1)
+    smtp_warmup = None
+    if email_sender.smtp_user and email_sender.smtp_password and email_sender.to_email:
+        smtp_warmup = executor.submit(email_sender.connect)
+
+    try:
+        # Initialize fetcher
+        fetcher = BOEOISFetcher()
+
+        # Fetch OIS data
+        print("Fetching Bank of England OIS data...")
+        try:
+            data, error = fetcher.fetch_ois_data()
+        finally:
+            fetcher.close()
+
+        if error:
+            print(f"ERROR: {error}")
+            sys.exit(1)
+
+        if not data:
+            print("ERROR: No data returned")
+            sys.exit(1)
+
+        print("✓ Data fetched successfully")
+
+        # Generate summary
+        text_summary = fetcher.format_summary(data)
+        print("\n" + text_summary)
+
+        # Check if email is configured
+        if not email_sender.smtp_user or not email_sender.to_email:
+            print("\n⚠ Email not configured - skipping email send")
+            print("To enable email, set these environment variables:")
+            print("  SMTP_USER, SMTP_PASSWORD, TO_EMAIL")
+            print("\nOptional (with defaults):")
+            print("  SMTP_HOST (default: smtp.gmail.com)")
+            print("  SMTP_PORT (default: 465 for smtp.gmail.com, 587 otherwise)")
+            print("  SMTP_SSL (default: on for port 465, STARTTLS otherwise)")
+            print("  FROM_EMAIL (default: same as SMTP_USER)")
+            return
+
+        # Send email
+        print("\nSending email notification...")
+
+        subject = f"OIS Rates - {data['latest_date'].strftime('%d %B %Y')}"
+        html_body = email_sender.create_ois_html_email(data)
+
+        # Make sure the background connect has finished before sending;
+        # if it failed, send_email reconnects and reports the error itself
+        if smtp_warmup is not None:
+            try:
+                smtp_warmup.result()
+            except Exception:
+                pass
+
+        success, error = email_sender.send_email(
+            subject=subject,
+            body=text_summary,
+            html_body=html_body
+        )
+
+        if success:
+            print(f"✓ Email sent successfully to {email_sender.to_email}")
+        else:
+            print(f"✗ Email failed: {error}")
+            sys.exit(1)
+
+        print(f"\n[{time.strftime('%Y-%m-%d %H:%M:%S')}] OIS Daily Agent completed")
+    finally:
+        executor.shutdown(wait=True)
+        email_sender.close()
 
 
 if __name__ == "__main__":
@@ -6,14 +6,83 @@ and extracts 2yr, 5yr, and 10yr rates with day-over-day changes.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+import json
+import os
+import posixpath
+import random
+import shutil
+import tempfile
+import time
 from zipfile import ZipFile
-from io import BytesIO
-import openpyxl
-from datetime import datetime, timedelta
-from typing import Dict, Optional, Tuple
-import warnings
-
-warnings.filterwarnings('ignore', category=UserWarning)
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# SpreadsheetML namespaces used when reading the xlsx parts directly
+_MAIN_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_PKG_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+# Day zero for Excel serial dates (1900 date system)
+_EXCEL_EPOCH = datetime(1899, 12, 30)
+
+# Change arrows indexed by sign + 1 (down, flat, up)
+_ARROWS = ('↓', '→', '↑')
+
+
+def _load_calamine():
+    """
+    Import python-calamine on first use, returning CalamineWorkbook or None.
+
+    Kept out of module scope so that runs answered from the cache (HTTP 304)
+    never load a workbook reader at all.
+    """
+    try:
+        from python_calamine import CalamineWorkbook
+    except ImportError:  # optional; the stdlib XML reader is used instead
+        return None
+    return CalamineWorkbook
+
+
+def _column_index(ref: str) -> int:
+    """Convert a cell reference such as 'AB12' to a zero-based column index."""
+    col = 0
+    for ch in ref:
+        if not ch.isalpha():
+            break
+        col = col * 26 + (ord(ch.upper()) - 64)
+    return col - 1
+
+
+def _cell_value(cell, shared_strings: List[str]):
+    """Return the Python value of a worksheet <c> element."""
+    cell_type = cell.get('t', 'n')
+    if cell_type == 'inlineStr':
+        return ''.join(t.text or '' for t in cell.iter(_MAIN_NS + 't'))
+
+    v = cell.find(_MAIN_NS + 'v')
+    if v is None or v.text is None:
+        return None
+    if cell_type == 'n':
+        return float(v.text)
+    if cell_type == 's':
+        return shared_strings[int(v.text)]
+    if cell_type == 'b':
+        return v.text == '1'
+    if cell_type == 'e':
+        return None
+    return v.text
+
+
+def _excel_date(value) -> Optional[datetime]:
+    """Convert an Excel serial date (or a date) to a datetime; other values give None."""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    if isinstance(value, float):
+        return _EXCEL_EPOCH + timedelta(days=value)
+    return None
 
 
 class BOEOISFetcher:
@@ -22,12 +91,42 @@ class BOEOISFetcher:
     BOE_URL = "https://www.bankofengland.co.uk/-/media/boe/files/statistics/yield-curves/latest-yield-curve-data.zip"
     OIS_FILENAME = "OIS daily data current month.xlsx"
     SHEET_NAME = "4. spot curve"
+    # Tenor label -> maturity in years, as listed in the sheet's maturity row
+    TENORS = {'2yr': 2, '5yr': 5, '10yr': 10}
+    DOWNLOAD_CHUNK_SIZE = 64 * 1024
+    SPOOL_MAX_SIZE = 8 * 1024 * 1024
+    MAX_ATTEMPTS = 5
+    RETRY_BASE_DELAY = 0.5
+    RETRY_MAX_DELAY = 30
+    CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'rated-feeder', 'boe_etag.json')
+
+    # Column indices of TENORS from the last parse, shared across instances
+    _COL_CACHE = None
+
+    def __init__(self, boe_url: Optional[str] = None, ois_filename: Optional[str] = None):
+        """
+        Initialize the fetcher.
+
+        Args:
+            boe_url: URL of the yield-curve ZIP (default: BOE_URL)
+            ois_filename: OIS workbook name inside the ZIP (default: OIS_FILENAME)
+        """
+        self.boe_url = boe_url or self.BOE_URL
+        self.ois_filename = ois_filename or self.OIS_FILENAME
 
-    def __init__(self):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
         }
 
+        # Keep-alive session so repeated fetches reuse the TLS connection
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
+    def close(self):
+        """Close the underlying HTTP session."""
+        self.session.close()
+
     def fetch_ois_data(self) -> Tuple[Optional[Dict], Optional[str]]:
         """
         Fetch OIS data from Bank of England.
@@ -36,19 +135,46 @@ class BOEOISFetcher:
             Tuple of (data_dict, error_message)
             data_dict contains latest and previous rates with changes
         """
+        # Spool the download to a temp file rather than holding it in memory
+        buf = tempfile.SpooledTemporaryFile(max_size=self.SPOOL_MAX_SIZE)
         try:
+            # Conditional GET: skip download and parse if the ZIP is unchanged
+            cache = self._load_cache()
+            conditional_headers = {}
+            if cache is not None:
+                if cache.get('etag'):
+                    conditional_headers['If-None-Match'] = cache['etag']
+                if cache.get('last_modified'):
+                    conditional_headers['If-Modified-Since'] = cache['last_modified']
+                if self._COL_CACHE is None and cache.get('columns'):
+                    type(self)._COL_CACHE = tuple(cache['columns'])
+
             # Download ZIP file
-            response = requests.get(self.BOE_URL, headers=self.headers, timeout=30)
-            response.raise_for_status()
+            response = self._download(buf, conditional_headers)
+            if response.status_code == 304 and cache is not None:
+                return self._decode_cached_data(cache['data']), None
 
             # Extract OIS Excel file
-            with ZipFile(BytesIO(response.content)) as zip_file:
-                with zip_file.open(self.OIS_FILENAME) as ois_file:
-                    wb = openpyxl.load_workbook(ois_file)
-                    sheet = wb[self.SHEET_NAME]
+            with ZipFile(buf) as zip_file:
+                with tempfile.SpooledTemporaryFile(max_size=self.SPOOL_MAX_SIZE) as xlsx_buf:
+                    # The xlsx is itself a ZIP, so it needs a seekable copy
+                    # getinfo() is a dict lookup; opening by ZipInfo skips a second one
+                    ois_info = zip_file.getinfo(self.ois_filename)
+                    with zip_file.open(ois_info) as ois_file:
+                        shutil.copyfileobj(ois_file, xlsx_buf, self.DOWNLOAD_CHUNK_SIZE)
+                    xlsx_buf.seek(0)
 
                     # Parse the data
-                    return self._parse_ois_sheet(sheet), None
+                    calamine_workbook = _load_calamine()
+                    if calamine_workbook is not None:
+                        wb = calamine_workbook.from_filelike(xlsx_buf)
+                        data = self._parse_ois_sheet(self._iter_calamine_rows(wb))
+                    else:
+                        with ZipFile(xlsx_buf) as xlsx:
+                            data = self._parse_ois_sheet(self._iter_sheet_rows(xlsx))
+
+            self._save_cache(response, data)
+            return data, None
 
         except requests.RequestException as e:
             return None, f"Network error: {str(e)}"
@@ -56,80 +182,279 @@ class BOEOISFetcher:
             return None, f"Sheet not found: {str(e)}"
         except Exception as e:
             return None, f"Error fetching OIS data: {str(e)}"
+        finally:
+            buf.close()
 
-    def _parse_ois_sheet(self, sheet) -> Dict:
+    def _download(self, buf, headers: Optional[Dict[str, str]] = None) -> requests.Response:
         """
-        Parse OIS spot curve sheet to extract 2yr, 5yr, 10yr rates.
+        Download the BoE ZIP into buf, retrying transient failures.
 
-        Sheet structure:
-        - Row 4 contains maturity years (0.5, 1, 1.5, 2, 2.5, 3, ..., 5, ..., 10, ...)
-        - Row 6+ contains dates and rates
+        Retries use full-jitter exponential backoff so that repeated runs
+        don't hit the server in lockstep. Client errors (4xx) are not
+        retried; the last exception is re-raised once attempts run out.
+
+        Returns:
+            The (closed) response; on a 304 Not Modified buf is left empty
+        """
+        for attempt in range(self.MAX_ATTEMPTS):
+            buf.seek(0)
+            buf.truncate()
+            try:
+                with self.session.get(self.boe_url, headers=headers, timeout=30, stream=True) as response:
+                    response.raise_for_status()
+                    if response.status_code != 304:
+                        for chunk in response.iter_content(chunk_size=self.DOWNLOAD_CHUNK_SIZE):
+                            buf.write(chunk)
+                buf.seek(0)
+                return response
+            except requests.RequestException as e:
+                status = e.response.status_code if e.response is not None else None
+                if attempt == self.MAX_ATTEMPTS - 1 or (status is not None and status < 500):
+                    raise
+                delay = random.uniform(0, min(self.RETRY_MAX_DELAY, 2 ** attempt * self.RETRY_BASE_DELAY))
+                time.sleep(delay)
+
+    def _cache_identity(self) -> Dict:
+        """Fields that tie a cache record to the request and parse that produced it."""
+        return {
+            'boe_url': self.boe_url,
+            'ois_filename': self.ois_filename,
+            'sheet_name': self.SHEET_NAME,
+            'tenors': self.TENORS
+        }
+
+    def _load_cache(self) -> Optional[Dict]:
+        """
+        Load the cached validators and parsed data, or None if unavailable.
+
+        Records written for a different request, or lacking the identity
+        fields altogether, are ignored so their validators are never sent.
+        """
+        try:
+            with open(self.CACHE_PATH, encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(cache, dict) or 'data' not in cache:
+            return None
+        for field, value in self._cache_identity().items():
+            if field not in cache or cache[field] != value:
+                return None
+        return cache
+
+    def _save_cache(self, response: requests.Response, data: Dict):
+        """Persist the response's ETag/Last-Modified, the parsed data and tenor columns."""
+        cache = dict(
+            self._cache_identity(),
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified'),
+            columns=list(self._COL_CACHE) if self._COL_CACHE else None,
+            data=dict(
+                data,
+                latest_date=data['latest_date'].isoformat(),
+                previous_date=data['previous_date'].isoformat()
+            )
+        )
+        # Caching is best-effort; a read-only home directory shouldn't fail the fetch
+        try:
+            os.makedirs(os.path.dirname(self.CACHE_PATH), exist_ok=True)
+            with open(self.CACHE_PATH, 'w', encoding='utf-8') as f:
+                json.dump(cache, f)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _decode_cached_data(data: Dict) -> Dict:
+        """Restore the datetimes in a cached data dict."""
+        return dict(
+            data,
+            latest_date=datetime.fromisoformat(data['latest_date']),
+            previous_date=datetime.fromisoformat(data['previous_date'])
+        )
+
+    def _iter_calamine_rows(self, wb) -> Iterator[Tuple[int, List]]:
+        """
+        Stream (row_number, values) pairs from the OIS sheet using python-calamine.
+
+        Same contract as _iter_sheet_rows; calamine's empty-string blanks are
+        mapped to None so both readers feed _parse_ois_sheet identically.
+        The workbook is closed once iteration ends.
+        """
+        try:
+            if self.SHEET_NAME not in wb.sheet_names:
+                raise KeyError(self.SHEET_NAME)
+            sheet = wb.get_sheet_by_name(self.SHEET_NAME)
+
+            # skip_empty_area=False keeps list positions aligned with row/column numbers
+            for row_number, row in enumerate(sheet.to_python(skip_empty_area=False), start=1):
+                yield row_number, [None if value == '' else value for value in row]
+        finally:
+            wb.close()
+
+    def _iter_sheet_rows(self, xlsx: ZipFile) -> Iterator[Tuple[int, List]]:
+        """
+        Stream (row_number, values) pairs from the OIS sheet of an xlsx archive.
+
+        The worksheet XML is read directly with iterparse rather than through
+        a spreadsheet library, since only a handful of cells are needed.
+        Values are floats for numeric cells, text for string cells and None
+        for blanks; each row list is indexed by zero-based column.
         """
-        # Find column indices for 2yr, 5yr, 10yr
-        maturity_row = list(sheet.iter_rows(min_row=4, max_row=4, values_only=True))[0]
+        from xml.etree.ElementTree import iterparse
+
+        sheet_path = self._find_sheet_path(xlsx)
+        shared_strings = self._read_shared_strings(xlsx)
+
+        row_number = 0
+        with xlsx.open(sheet_path) as sheet_xml:
+            for _, elem in iterparse(sheet_xml, events=('end',)):
+                if elem.tag != _MAIN_NS + 'row':
+                    continue
+
+                values = []
+                for cell in elem.iter(_MAIN_NS + 'c'):
+                    ref = cell.get('r')
+                    col = _column_index(ref) if ref else len(values)
+                    if col >= len(values):
+                        values.extend([None] * (col + 1 - len(values)))
+                    values[col] = _cell_value(cell, shared_strings)
+
+                # Row numbers are optional in the schema; fall back to counting
+                row_number = int(elem.get('r', row_number + 1))
+                yield row_number, values
+                elem.clear()
+
+    def _find_sheet_path(self, xlsx: ZipFile) -> str:
+        """Resolve SHEET_NAME to its worksheet part via workbook.xml and its rels."""
+        from xml.etree import ElementTree
+
+        workbook = ElementTree.fromstring(xlsx.read('xl/workbook.xml'))
+        rel_id = None
+        for sheet in workbook.iter(_MAIN_NS + 'sheet'):
+            if sheet.get('name') == self.SHEET_NAME:
+                rel_id = sheet.get(_REL_NS + 'id')
+                break
+        if rel_id is None:
+            raise KeyError(self.SHEET_NAME)
+
+        rels = ElementTree.fromstring(xlsx.read('xl/_rels/workbook.xml.rels'))
+        for rel in rels.iter(_PKG_REL_NS + 'Relationship'):
+            if rel.get('Id') == rel_id:
+                target = rel.get('Target')
+                if target.startswith('/'):
+                    return target.lstrip('/')
+                return posixpath.normpath(posixpath.join('xl', target))
+        raise KeyError(self.SHEET_NAME)
+
+    @staticmethod
+    def _read_shared_strings(xlsx: ZipFile) -> List[str]:
+        """Load the workbook's shared string table, if it has one."""
+        from xml.etree import ElementTree
 
-        col_2yr = None
-        col_5yr = None
-        col_10yr = None
+        try:
+            with xlsx.open('xl/sharedStrings.xml') as f:
+                root = ElementTree.parse(f).getroot()
+        except KeyError:
+            return []
+        return [
+            ''.join(t.text or '' for t in si.iter(_MAIN_NS + 't'))
+            for si in root.iter(_MAIN_NS + 'si')
+        ]
+
+    def _find_tenor_columns(self, maturity_row) -> List[int]:
+        """
+        Return the column index of each TENORS maturity in the maturity row.
 
+        The BoE layout rarely changes, so the indices found last time are
+        tried first and the row is only searched if they no longer match.
+        """
+        cached = self._COL_CACHE
+        if cached is not None and len(cached) == len(self.TENORS) and all(
+            col < len(maturity_row) and maturity_row[col] == years
+            for col, years in zip(cached, self.TENORS.values())
+        ):
+            return list(cached)
+
+        wanted = {years: tenor for tenor, years in self.TENORS.items()}
+        found = {}
         for idx, value in enumerate(maturity_row):
-            if value == 2:
-                col_2yr = idx
-            elif value == 5:
-                col_5yr = idx
-            elif value == 10:
-                col_10yr = idx
-
-        if col_2yr is None or col_5yr is None or col_10yr is None:
-            raise ValueError("Could not find 2yr, 5yr, or 10yr columns")
-
-        # Extract latest and previous day's data
-        data_rows = []
-        for row in sheet.iter_rows(min_row=6, values_only=True):
-            date_val = row[0]
-            if isinstance(date_val, datetime):
-                data_rows.append({
-                    'date': date_val,
-                    'rate_2yr': row[col_2yr],
-                    'rate_5yr': row[col_5yr],
-                    'rate_10yr': row[col_10yr]
-                })
-
-        # Sort by date descending
-        data_rows.sort(key=lambda x: x['date'], reverse=True)
-
-        if len(data_rows) < 2:
-            raise ValueError("Insufficient data to calculate changes")
+            tenor = wanted.get(value)
+            if tenor is not None and tenor not in found:
+                found[tenor] = idx
+                if len(found) == len(wanted):
+                    break
+
+        missing = [tenor for tenor in self.TENORS if tenor not in found]
+        if missing:
+            raise ValueError(f"Could not find {', '.join(missing)} columns")
 
-        latest = data_rows[0]
-        previous = data_rows[1]
+        tenor_cols = [found[tenor] for tenor in self.TENORS]
+        type(self)._COL_CACHE = tuple(tenor_cols)
+        return tenor_cols
+
+    def _parse_ois_sheet(self, rows) -> Dict:
+        """
+        Parse OIS spot curve sheet to extract the TENORS rates (2yr, 5yr, 10yr).
+
+        Sheet structure:
+        - Row 4 contains maturity years (0.5, 1, 1.5, 2, 2.5, 3, ..., 5, ..., 10, ...)
+        - Row 6+ contains dates and rates, in ascending date order
+
+        Args:
+            rows: (row_number, values) pairs as produced by _iter_sheet_rows,
+                walked once: row 4 gives the column indices, rows 6+ the data
+        """
+        tenor_cols = None
+
+        # Two most recent (date, rates) rows seen so far; rates follow TENORS order
+        latest = previous = None
+        for row_idx, row in rows:
+            if row_idx == 4:
+                tenor_cols = self._find_tenor_columns(row)
+                last_col = max(tenor_cols)
+                continue
+
+            if row_idx < 6 or tenor_cols is None:
+                continue
+
+            # Extract latest and previous day's data
+            date_val = _excel_date(row[0]) if row else None
+            if date_val is not None:
+                # Trailing blank cells are not stored, so pad short rows
+                if len(row) <= last_col:
+                    row = row + [None] * (last_col + 1 - len(row))
+                # BoE rows run oldest to newest, so the last two rows are the
+                # ones we want; check the order rather than sorting
+                if latest is not None and date_val <= latest[0]:
+                    raise ValueError(
+                        f"OIS rows out of date order at row {row_idx}: "
+                        f"{date_val:%Y-%m-%d} after {latest[0]:%Y-%m-%d}"
+                    )
+                previous, latest = latest, (date_val, [row[col] for col in tenor_cols])
+
+        if tenor_cols is None:
+            raise ValueError("Could not find maturity row")
+
+        if previous is None:
+            raise ValueError("Insufficient data to calculate changes")
 
         # Calculate changes (in basis points)
-        def calculate_change(latest_rate, prev_rate):
+        rates = {}
+        for tenor, latest_rate, prev_rate in zip(self.TENORS, latest[1], previous[1]):
             if latest_rate is not None and prev_rate is not None:
-                return (latest_rate - prev_rate) * 100  # Convert to basis points
-            return None
+                change_bps = (latest_rate - prev_rate) * 100
+            else:
+                change_bps = None
+            rates[tenor] = {
+                'current': latest_rate,
+                'previous': prev_rate,
+                'change_bps': change_bps
+            }
 
         result = {
-            'latest_date': latest['date'],
-            'previous_date': previous['date'],
-            'rates': {
-                '2yr': {
-                    'current': latest['rate_2yr'],
-                    'previous': previous['rate_2yr'],
-                    'change_bps': calculate_change(latest['rate_2yr'], previous['rate_2yr'])
-                },
-                '5yr': {
-                    'current': latest['rate_5yr'],
-                    'previous': previous['rate_5yr'],
-                    'change_bps': calculate_change(latest['rate_5yr'], previous['rate_5yr'])
-                },
-                '10yr': {
-                    'current': latest['rate_10yr'],
-                    'previous': previous['rate_10yr'],
-                    'change_bps': calculate_change(latest['rate_10yr'], previous['rate_10yr'])
-                }
-            }
+            'latest_date': latest[0],
+            'previous_date': previous[0],
+            'rates': rates
         }
 
         return result
@@ -152,14 +477,18 @@ Previous Data: {previous_date}
             previous = values['previous']
             change = values['change_bps']
 
-            change_str = f"{change:+.2f} bps" if change is not None else "N/A"
-            arrow = "↑" if change and change > 0 else "↓" if change and change < 0 else "→"
+            if change is None:
+                change_str = "N/A"
+                arrow = _ARROWS[1]
+            else:
+                change_str = f"{change:+.2f} bps"
+                arrow = _ARROWS[(change > 0) - (change < 0) + 1]
 
             summary += f"{tenor:>4} Rate: {current:>6.3f}% (was {previous:>6.3f}%) {arrow} {change_str}\n"
 
         summary += f"\n{'='*50}\n"
         summary += f"Data source: Bank of England\n"
-        summary += f"Fetched at: {datetime.now().strftime('%d %B %Y %H:%M:%S')}\n"
+        summary += f"Fetched at: {time.strftime('%d %B %Y %H:%M:%S')}\n"
 
         return summary
 
@@ -169,7 +498,10 @@ def main():
     fetcher = BOEOISFetcher()
 
     print("Fetching Bank of England OIS data...")
-    data, error = fetcher.fetch_ois_data()
+    try:
+        data, error = fetcher.fetch_ois_data()
+    finally:
+        fetcher.close()
 
     if error:
         print(f"Error: {error}")
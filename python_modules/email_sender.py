@@ -6,13 +6,139 @@ Supports SMTP configuration for various email providers.
 """
 
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from datetime import datetime
+from email.message import EmailMessage
+from email.utils import formatdate
 from typing import Optional, Tuple
 import os
 
 
+# Arrow and CSS class per change direction, indexed by sign + 1
+_ARROWS = ('↓', '→', '↑')
+_CLASSES = ('negative', 'neutral', 'positive')
+
+# Stylesheet for the OIS summary email; static, so it is built once
+_CSS = """    <style>
+        body {
+            font-family: Arial, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            max-width: 600px;
+            margin: 0 auto;
+            padding: 20px;
+        }
+        .header {
+            background-color: #002147;
+            color: white;
+            padding: 20px;
+            text-align: center;
+            border-radius: 5px 5px 0 0;
+        }
+        .content {
+            background-color: #f4f4f4;
+            padding: 20px;
+        }
+        .rate-table {
+            width: 100%;
+            border-collapse: collapse;
+            margin: 20px 0;
+            background-color: white;
+        }
+        .rate-table th {
+            background-color: #002147;
+            color: white;
+            padding: 12px;
+            text-align: left;
+        }
+        .rate-table td {
+            padding: 12px;
+            border-bottom: 1px solid #ddd;
+        }
+        .rate-table tr:hover {
+            background-color: #f5f5f5;
+        }
+        .positive {
+            color: #28a745;
+            font-weight: bold;
+        }
+        .negative {
+            color: #dc3545;
+            font-weight: bold;
+        }
+        .neutral {
+            color: #6c757d;
+            font-weight: bold;
+        }
+        .footer {
+            text-align: center;
+            padding: 20px;
+            font-size: 12px;
+            color: #666;
+        }
+        .date-info {
+            background-color: white;
+            padding: 15px;
+            margin: 10px 0;
+            border-left: 4px solid #002147;
+        }
+    </style>
+"""
+
+# HTML layout for the OIS summary email, split around the values filled in
+# per send: latest date, previous date and the table rows (from _ROW_TMPL)
+_HTML_PREFIX = """
+<!DOCTYPE html>
+<html>
+<head>
+""" + _CSS + """</head>
+<body>
+    <div class="header">
+        <h1>Bank of England OIS Rates</h1>
+        <p>Daily Summary</p>
+    </div>
+    <div class="content">
+        <div class="date-info">
+            <strong>Latest Data:</strong> """
+
+_HTML_DATE_SEP = """<br>
+            <strong>Previous Data:</strong> """
+
+_HTML_MID = """
+        </div>
+
+        <table class="rate-table">
+            <thead>
+                <tr>
+                    <th>Tenor</th>
+                    <th>Current Rate</th>
+                    <th>Previous Rate</th>
+                    <th>Change (bps)</th>
+                </tr>
+            </thead>
+            <tbody>
+"""
+
+_HTML_SUFFIX = """
+            </tbody>
+        </table>
+    </div>
+    <div class="footer">
+        <p>Data source: Bank of England</p>
+        <p>This is an automated daily summary of OIS rates.</p>
+    </div>
+</body>
+</html>
+"""
+
+_ROW_TMPL = """
+                <tr>
+                    <td><strong>{tenor}</strong></td>
+                    <td>{current:.3f}%</td>
+                    <td>{previous:.3f}%</td>
+                    <td class="{cls}">{change_str}</td>
+                </tr>
+"""
+
+
 class EmailSender:
     """Handles sending email notifications."""
 
@@ -23,26 +149,94 @@ class EmailSender:
         smtp_user: Optional[str] = None,
         smtp_password: Optional[str] = None,
         from_email: Optional[str] = None,
-        to_email: Optional[str] = None
+        to_email: Optional[str] = None,
+        smtp_ssl: Optional[bool] = None
     ):
         """
         Initialize EmailSender with SMTP configuration.
 
         Parameters can be provided directly or via environment variables:
         - SMTP_HOST
-        - SMTP_PORT
+        - SMTP_PORT (defaults to 465 for smtp.gmail.com, 587 otherwise)
         - SMTP_USER
         - SMTP_PASSWORD
         - FROM_EMAIL
         - TO_EMAIL
+        - SMTP_SSL (1/0; defaults to on for port 465, STARTTLS otherwise)
         """
         self.smtp_host = smtp_host or os.getenv('SMTP_HOST', 'smtp.gmail.com')
-        self.smtp_port = smtp_port or int(os.getenv('SMTP_PORT', '587'))
+        # Gmail accepts implicit TLS on 465; other relays may be STARTTLS-only on 587
+        default_port = '465' if self.smtp_host == 'smtp.gmail.com' else '587'
+        self.smtp_port = smtp_port or int(os.getenv('SMTP_PORT', default_port))
         self.smtp_user = smtp_user or os.getenv('SMTP_USER', '')
         self.smtp_password = smtp_password or os.getenv('SMTP_PASSWORD', '')
         self.from_email = from_email or os.getenv('FROM_EMAIL', self.smtp_user)
         self.to_email = to_email or os.getenv('TO_EMAIL', '')
 
+        # Implicit TLS skips the STARTTLS round trip; 587 still uses STARTTLS
+        if smtp_ssl is None:
+            ssl_env = os.getenv('SMTP_SSL', '')
+            smtp_ssl = ssl_env.lower() in ('1', 'true', 'yes') if ssl_env else self.smtp_port == 465
+        self.smtp_ssl = smtp_ssl
+
+        # Authenticated SMTP connection, kept open between sends
+        self._server = None
+
+    def _get_server(self) -> smtplib.SMTP:
+        """
+        Return a logged-in SMTP connection, reusing the previous one if alive.
+
+        Raises:
+            smtplib.SMTPException or OSError if connecting or logging in fails
+        """
+        if self._server is not None:
+            try:
+                if self._server.noop()[0] == 250:
+                    return self._server
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._drop_server()
+
+        if self.smtp_ssl:
+            server = smtplib.SMTP_SSL(self.smtp_host, self.smtp_port, timeout=30)
+        else:
+            server = smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=30)
+        try:
+            if not self.smtp_ssl:
+                server.starttls()
+            server.login(self.smtp_user, self.smtp_password)
+        except Exception:
+            server.close()
+            raise
+
+        self._server = server
+        return server
+
+    def connect(self):
+        """
+        Open and log in the SMTP session ahead of the first send.
+
+        Lets callers overlap the connect/login handshake with other work;
+        send_email reuses the session. Raises the same errors as _get_server.
+        """
+        self._get_server()
+
+    def _drop_server(self):
+        """Discard the cached SMTP connection without a clean QUIT."""
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+
+    def close(self):
+        """Close the SMTP connection if one is open."""
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            finally:
+                self._drop_server()
+
     def send_email(
         self,
         subject: str,
@@ -68,34 +262,32 @@ class EmailSender:
 
         try:
             # Create message
-            msg = MIMEMultipart('alternative')
+            msg = EmailMessage()
             msg['Subject'] = subject
             msg['From'] = self.from_email
             msg['To'] = self.to_email
-            msg['Date'] = datetime.now().strftime('%a, %d %b %Y %H:%M:%S %z')
+            msg['Date'] = formatdate(localtime=True)
 
             # Add plain text part
-            text_part = MIMEText(body, 'plain')
-            msg.attach(text_part)
+            msg.set_content(body)
 
             # Add HTML part if provided
             if html_body:
-                html_part = MIMEText(html_body, 'html')
-                msg.attach(html_part)
+                msg.add_alternative(html_body, subtype='html')
 
             # Send email
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.smtp_user, self.smtp_password)
-                server.send_message(msg)
+            server = self._get_server()
+            server.send_message(msg)
 
             return True, None
 
         except smtplib.SMTPAuthenticationError:
             return False, "SMTP authentication failed - check username/password"
         except smtplib.SMTPException as e:
+            self._drop_server()
             return False, f"SMTP error: {str(e)}"
         except Exception as e:
+            self._drop_server()
             return False, f"Error sending email: {str(e)}"
 
     def create_ois_html_email(self, data: dict) -> str:
@@ -111,139 +303,39 @@ class EmailSender:
         latest_date = data['latest_date'].strftime('%d %B %Y')
         previous_date = data['previous_date'].strftime('%d %B %Y')
 
-        html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <style>
-        body {{
-            font-family: Arial, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            max-width: 600px;
-            margin: 0 auto;
-            padding: 20px;
-        }}
-        .header {{
-            background-color: #002147;
-            color: white;
-            padding: 20px;
-            text-align: center;
-            border-radius: 5px 5px 0 0;
-        }}
-        .content {{
-            background-color: #f4f4f4;
-            padding: 20px;
-        }}
-        .rate-table {{
-            width: 100%;
-            border-collapse: collapse;
-            margin: 20px 0;
-            background-color: white;
-        }}
-        .rate-table th {{
-            background-color: #002147;
-            color: white;
-            padding: 12px;
-            text-align: left;
-        }}
-        .rate-table td {{
-            padding: 12px;
-            border-bottom: 1px solid #ddd;
-        }}
-        .rate-table tr:hover {{
-            background-color: #f5f5f5;
-        }}
-        .positive {{
-            color: #28a745;
-            font-weight: bold;
-        }}
-        .negative {{
-            color: #dc3545;
-            font-weight: bold;
-        }}
-        .neutral {{
-            color: #6c757d;
-            font-weight: bold;
-        }}
-        .footer {{
-            text-align: center;
-            padding: 20px;
-            font-size: 12px;
-            color: #666;
-        }}
-        .date-info {{
-            background-color: white;
-            padding: 15px;
-            margin: 10px 0;
-            border-left: 4px solid #002147;
-        }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>Bank of England OIS Rates</h1>
-        <p>Daily Summary</p>
-    </div>
-    <div class="content">
-        <div class="date-info">
-            <strong>Latest Data:</strong> {latest_date}<br>
-            <strong>Previous Data:</strong> {previous_date}
-        </div>
+        rows = ''.join(
+            self._format_rate_row(tenor, values)
+            for tenor, values in data['rates'].items()
+        )
 
-        <table class="rate-table">
-            <thead>
-                <tr>
-                    <th>Tenor</th>
-                    <th>Current Rate</th>
-                    <th>Previous Rate</th>
-                    <th>Change (bps)</th>
-                </tr>
-            </thead>
-            <tbody>
-"""
+        return (
+            f"{_HTML_PREFIX}{latest_date}{_HTML_DATE_SEP}{previous_date}"
+            f"{_HTML_MID}{rows}{_HTML_SUFFIX}"
+        )
 
-        for tenor, values in data['rates'].items():
-            current = values['current']
-            previous = values['previous']
-            change = values['change_bps']
-
-            if change is not None:
-                if change > 0:
-                    change_class = 'positive'
-                    arrow = '↑'
-                elif change < 0:
-                    change_class = 'negative'
-                    arrow = '↓'
-                else:
-                    change_class = 'neutral'
-                    arrow = '→'
-                change_str = f"{arrow} {abs(change):.2f}"
-            else:
-                change_class = 'neutral'
-                change_str = "N/A"
-
-            html += f"""
-                <tr>
-                    <td><strong>{tenor}</strong></td>
-                    <td>{current:.3f}%</td>
-                    <td>{previous:.3f}%</td>
-                    <td class="{change_class}">{change_str}</td>
-                </tr>
-"""
+    @staticmethod
+    def _format_rate_row(tenor: str, values: dict) -> str:
+        """Render one tenor's table row for the OIS HTML email."""
+        current = values['current']
+        previous = values['previous']
+        change = values['change_bps']
 
-        html += """
-            </tbody>
-        </table>
-    </div>
-    <div class="footer">
-        <p>Data source: Bank of England</p>
-        <p>This is an automated daily summary of OIS rates.</p>
-    </div>
-</body>
-</html>
-"""
-        return html
+        if change is None:
+            change_class = 'neutral'
+            change_str = "N/A"
+        else:
+            # -1/0/+1 sign shifted to 0/1/2 indexes the arrow and CSS class
+            sign = (change > 0) - (change < 0) + 1
+            change_class = _CLASSES[sign]
+            change_str = f"{_ARROWS[sign]} {abs(change):.2f}"
+
+        return _ROW_TMPL.format(
+            tenor=tenor,
+            current=current,
+            previous=previous,
+            cls=change_class,
+            change_str=change_str
+        )
 
 
 def main():
@@ -253,11 +345,12 @@ def main():
     print("Email Sender Configuration:")
     print(f"SMTP Host: {sender.smtp_host}")
     print(f"SMTP Port: {sender.smtp_port}")
+    print(f"SMTP SSL: {'implicit TLS' if sender.smtp_ssl else 'STARTTLS'}")
     print(f"SMTP User: {sender.smtp_user or 'Not configured'}")
     print(f"From Email: {sender.from_email or 'Not configured'}")
     print(f"To Email: {sender.to_email or 'Not configured'}")
     print("\nTo configure, set environment variables:")
-    print("  SMTP_HOST, SMTP_PORT, SMTP_USER, SMTP_PASSWORD, FROM_EMAIL, TO_EMAIL")
+    print("  SMTP_HOST, SMTP_PORT, SMTP_USER, SMTP_PASSWORD, FROM_EMAIL, TO_EMAIL, SMTP_SSL")
 
 
 if __name__ == "__main__":